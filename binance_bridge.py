@@ -1,8 +1,11 @@
 import json
+import logging
 import socket
+import struct
 import threading
+import itertools
+import os
 import time
-import random
 import websocket # pip install websocket-client
 
 # Configuration
@@ -10,11 +13,24 @@ BINANCE_WS = "wss://stream.binance.com:9443/ws/btcusdt@trade"
 LOCAL_ENGINE_IP = "127.0.0.1"
 LOCAL_ENGINE_PORT = 8083
 
+# Engine wire frame (little-endian): u32 payload length, then
+# id u64 | side u8 (0=Buy, 1=Sell) | price u64 (cents) | quantity u64
+ORDER_FRAME = struct.Struct('<IQBQQ')
+ORDER_PAYLOAD_LEN = ORDER_FRAME.size - 4
+SIDE_CODES = {"Buy": 0, "Sell": 1}
+
+logger = logging.getLogger("bridge")
+
+# Unique, increasing order IDs seeded from the startup clock
+_order_ids = itertools.count(int(time.time() * 1000000))
+
 # Connect to Local Rust Engine via TCP
 def connect_to_engine():
     try:
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         s.connect((LOCAL_ENGINE_IP, LOCAL_ENGINE_PORT))
+        s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
         print(f"✅ Connected to Local Engine at {LOCAL_ENGINE_IP}:{LOCAL_ENGINE_PORT}")
         return s
     except Exception as e:
@@ -23,24 +39,29 @@ def connect_to_engine():
 
 engine_socket = connect_to_engine()
 
-def send_order(side, price, quantity):
+def pack_order(side, price, quantity):
+    return ORDER_FRAME.pack(
+        ORDER_PAYLOAD_LEN,
+        next(_order_ids), # Unique ID
+        SIDE_CODES[side],
+        int(price * 100), # Convert to cents (e.g. $100.00 -> 10000)
+        int(quantity)
+    )
+
+def send_orders(orders):
+    """Send (side, price, quantity) orders to the engine in a single write."""
     if not engine_socket:
         return
 
-    order = {
-        "id": int(time.time() * 1000000) + random.randint(1, 1000), # Unique ID
-        "side": side,
-        "price": int(price * 100), # Convert to cents (e.g. $100.00 -> 10000)
-        "quantity": int(quantity)
-    }
-    
     try:
-        # Send JSON with newline delimiter
-        message = json.dumps(order) + "\n"
-        engine_socket.sendall(message.encode('utf-8'))
-        # print(f"Sent {side} @ {price}")
+        # Length-prefixed binary frames; the engine does not ack these
+        engine_socket.sendall(b"".join([pack_order(*o) for o in orders]))
+        # print(f"Sent {len(orders)} orders")
     except Exception as e:
-        print(f"Error sending: {e}")
+        logger.error("Error sending: %s", e)
+
+def send_order(side, price, quantity):
+    send_orders([(side, price, quantity)])
 
 # Handle incoming Binance messages
 def on_message(ws, message):
@@ -59,10 +80,9 @@ def on_message(ws, message):
     sell_price = btc_price + (spread / 2)
     
     # Send to our engine
-    send_order("Buy", buy_price, 1)
-    send_order("Sell", sell_price, 1)
+    send_orders([("Buy", buy_price, 1), ("Sell", sell_price, 1)])
     
-    print(f"📉 BTC: ${btc_price:.2f} | Placed BUY: ${buy_price:.2f} | Placed SELL: ${sell_price:.2f}")
+    logger.debug("📉 BTC: $%.2f | Placed BUY: $%.2f | Placed SELL: $%.2f", btc_price, buy_price, sell_price)
 
 def on_error(ws, error):
     print(f"Error: {error}")
@@ -74,6 +94,9 @@ def on_open(ws):
     print("✅ Connected to Binance Real-Time Feed")
 
 if __name__ == "__main__":
+    # INFO by default; set BRIDGE_LOG_LEVEL=DEBUG to see every tick
+    logging.basicConfig(level=os.getenv("BRIDGE_LOG_LEVEL", "INFO"), format="%(message)s")
+    
     print("🚀 Starting Crypto Bridge...")
     print("1. Listening to Binance (Real Data)")
     print("2. Forwarding to Local Rust Engine (Your Project)")
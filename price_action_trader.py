@@ -15,12 +15,19 @@ import json
 import time
 import hmac
 import hashlib
+import logging
+import logging.handlers
+import statistics
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import numpy as np
+import orjson
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional
-from urllib.parse import urlencode
 from dotenv import load_dotenv
 
 # Add parent directory to path
@@ -55,45 +62,145 @@ DASHBOARD_URL = "http://localhost:8083/api/ai-decision"
 SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
 ANALYSIS_INTERVAL = 60  # Recalculate every 60 seconds
 
+CANDLE_INTERVAL = "5m"
+CANDLE_INTERVAL_MS = 5 * 60 * 1000  # Signals are re-evaluated once per new bar
+
 STARTING_CAPITAL = 5000.0  # $5,000 for spot mode
 
+LOG_BUFFER_CAPACITY = 100  # Records held before a forced flush
+
+# Candle working-set dtype. float32 halves each frame; the indicators upcast
+# internally and the strategy reads prices back as Python floats. Switch to
+# np.float64 if a consumer needs full double precision on raw candles.
+CANDLE_DTYPE = np.float32
+
+LATENCY_WINDOW = 50  # Samples kept per endpoint for the status report
+
+DASHBOARD_COALESCE = 0.5  # Seconds the flusher waits for a newer payload
+
+ORDER_CLOCK_MAX_AGE = 1.0  # Seconds an order may reuse the cycle clock
+
+
+# ============================================================================
+# LOGGING
+# ============================================================================
+
+# Cycle output is buffered and written once per cycle (see run()) instead of
+# a blocking stdout write per line. ERROR records flush immediately.
+logger = logging.getLogger("trader")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_buffer = logging.handlers.MemoryHandler(
+    LOG_BUFFER_CAPACITY,
+    flushLevel=logging.ERROR,
+    target=logging.StreamHandler(sys.stdout)
+)
+logger.addHandler(_log_buffer)
+
+# Strategy diagnostics (emitted from the signal pool) share the buffer, so
+# they land in cycle order between the header and the status block
+_strategy_logger = logging.getLogger("strategy")
+_strategy_logger.setLevel(logging.INFO)
+_strategy_logger.propagate = False
+_strategy_logger.addHandler(_log_buffer)
+
+_RULE = '─' * 60
+
 
 # ============================================================================
 # BINANCE API
 # ============================================================================
 
-def get_signature(params: Dict) -> str:
-    query_string = urlencode(params)
-    return hmac.new(API_SECRET.encode(), query_string.encode(), hashlib.sha256).hexdigest()
+# Keep-alive pools: every call reuses the TCP/TLS connection instead of
+# handshaking per request. The API key header is attached once.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+if API_KEY:
+    _SESSION.headers.update({'X-MBX-APIKEY': API_KEY})
+
+_DASHBOARD_SESSION = requests.Session()
+_DASHBOARD_SESSION.headers.update({'Content-Type': 'application/json'})
+
+# endpoint -> recent round-trip times (seconds). Written from the pool and
+# the dashboard flusher while the main thread reports, so guarded by a lock.
+_LATENCY: Dict[str, deque] = {}
+_LATENCY_LOCK = threading.Lock()
+
+
+def _record_latency(endpoint: str, started: float):
+    """Record the time since `started` (perf_counter) against an endpoint."""
+    elapsed = time.perf_counter() - started
+    with _LATENCY_LOCK:
+        samples = _LATENCY.get(endpoint)
+        if samples is None:
+            samples = _LATENCY[endpoint] = deque(maxlen=LATENCY_WINDOW)
+        samples.append(elapsed)
+
+
+def latency_summary() -> Dict[str, float]:
+    """Median round-trip time (ms) per endpoint."""
+    with _LATENCY_LOCK:
+        snapshot = [(ep, list(samples)) for ep, samples in _LATENCY.items() if samples]
+    return {ep: statistics.median(samples) * 1000 for ep, samples in snapshot}
+
+
+_KLINES_URL = f"{BINANCE_BASE_URL}/klines"
+_TICKER_URL = f"{BINANCE_BASE_URL}/ticker/price"
+_ACCOUNT_URL = f"{BINANCE_BASE_URL}/account"
+_ORDER_URL = f"{BINANCE_BASE_URL}/order"
+
+# Fixed, already URL-safe fields of every market order
+_ORDER_STATIC = "type=MARKET"
+
+
+# Keyed HMAC state built once; each signature clones it instead of
+# re-deriving the padded key from the secret
+_HMAC_TEMPLATE = hmac.new(API_SECRET.encode(), digestmod=hashlib.sha256)
+
+
+def sign_query(query_string: str) -> str:
+    mac = _HMAC_TEMPLATE.copy()
+    mac.update(query_string.encode())
+    return mac.hexdigest()
 
 
 def get_candles(symbol: str, interval: str, limit: int = 250) -> pd.DataFrame:
     """Fetch candlestick data. Need 250 for EMA 200."""
     try:
-        url = f"{BINANCE_BASE_URL}/klines"
         params = {'symbol': symbol, 'interval': interval, 'limit': limit}
-        response = requests.get(url, params=params, timeout=10)
+        t0 = time.perf_counter()
+        response = _SESSION.get(_KLINES_URL, params=params, timeout=10)
+        _record_latency('klines', t0)
         
         if response.status_code != 200:
             return pd.DataFrame()
         
-        data = response.json()
-        df = pd.DataFrame(data, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
+        data = orjson.loads(response.content)
+        # Kline rows are [open_time, open, high, low, close, volume, ...] as
+        # strings; convert the five used fields in one vectorised pass.
+        arr = np.array([row[1:6] for row in data], dtype=CANDLE_DTYPE).reshape(-1, 5)
+        df = pd.DataFrame(arr, columns=['open', 'high', 'low', 'close', 'volume'], copy=False)
+        df.insert(0, 'time', np.array([row[0] for row in data], dtype=np.int64))  # Open time (ms)
+        return df
+    except Exception as e:
+        logger.warning("⚠️ Error fetching candles: %s", e)
+        return pd.DataFrame()
+
+
+def get_price(symbol: str) -> Optional[float]:
+    """Get the latest trade price from the (much smaller) ticker endpoint."""
+    try:
+        t0 = time.perf_counter()
+        response = _SESSION.get(_TICKER_URL, params={'symbol': symbol}, timeout=10)
+        _record_latency('ticker', t0)
         
-        df['open'] = df['open'].astype(float)
-        df['high'] = df['high'].astype(float)
-        df['low'] = df['low'].astype(float)
-        df['close'] = df['close'].astype(float)
-        df['volume'] = df['volume'].astype(float)
+        if response.status_code != 200:
+            return None
         
-        return df[['open', 'high', 'low', 'close', 'volume']]
+        return float(orjson.loads(response.content)['price'])
     except Exception as e:
-        print(f"⚠️ Error fetching candles: {e}")
-        return pd.DataFrame()
+        logger.warning("⚠️ Error fetching price: %s", e)
+        return None
 
 
 def get_balance() -> float:
@@ -102,41 +209,48 @@ def get_balance() -> float:
         if not API_KEY:
             return STARTING_CAPITAL
         
-        headers = {'X-MBX-APIKEY': API_KEY}
-        params = {'timestamp': int(time.time() * 1000)}
-        params['signature'] = get_signature(params)
+        query = f"timestamp={int(time.time() * 1000)}"
         
-        response = requests.get(f"{BINANCE_BASE_URL}/account", params=params, headers=headers, timeout=10)
+        t0 = time.perf_counter()
+        response = _SESSION.get(f"{_ACCOUNT_URL}?{query}&signature={sign_query(query)}", timeout=10)
+        _record_latency('account', t0)
         
         if response.status_code == 200:
-            for b in response.json().get('balances', []):
+            for b in orjson.loads(response.content).get('balances', []):
                 if b['asset'] == 'USDT':
                     return float(b['free'])
         return STARTING_CAPITAL
-    except:
+    except requests.Timeout:
+        logger.warning("⚠️ Balance request timed out")
+        return STARTING_CAPITAL
+    except (requests.RequestException, ValueError, KeyError) as e:
+        logger.warning("⚠️ Error fetching balance: %s", e)
         return STARTING_CAPITAL
 
 
-def place_order(symbol: str, side: str, quantity: float) -> Optional[Dict]:
-    """Place market order."""
+def place_order(symbol: str, side: str, quantity: float, timestamp: Optional[int] = None) -> Optional[Dict]:
+    """Place market order. `timestamp` (ms) defaults to now."""
     if not API_KEY:
-        print(f"📝 PAPER: {side} {quantity:.6f} {symbol}")
+        logger.info("📝 PAPER: %s %.6f %s", side, quantity, symbol)
         return {"status": "FILLED", "paper": True}
     
     try:
-        headers = {'X-MBX-APIKEY': API_KEY}
-        params = {
-            'symbol': symbol,
-            'side': side,
-            'type': 'MARKET',
-            'quantity': f"{quantity:.6f}",
-            'timestamp': int(time.time() * 1000)
-        }
-        params['signature'] = get_signature(params)
+        # Symbols, sides and formatted numbers are URL-safe, so the query is
+        # built directly; the same string is signed and sent as-is
+        query = (
+            f"symbol={symbol}&side={side}&{_ORDER_STATIC}"
+            f"&quantity={quantity:.6f}&timestamp={timestamp or int(time.time() * 1000)}"
+        )
         
-        response = requests.post(f"{BINANCE_BASE_URL}/order", params=params, headers=headers, timeout=10)
+        t0 = time.perf_counter()
+        response = _SESSION.post(f"{_ORDER_URL}?{query}&signature={sign_query(query)}", timeout=10)
+        _record_latency('order', t0)
         return response.json() if response.status_code == 200 else None
-    except:
+    except requests.Timeout:
+        logger.warning("⚠️ Order request timed out: %s %s", side, symbol)
+        return None
+    except (requests.RequestException, ValueError) as e:
+        logger.warning("⚠️ Order error: %s", e)
         return None
 
 
@@ -171,6 +285,28 @@ class TrendMomentumTrader:
         self.wins = 0
         self.losses = 0
         
+        # Trades opened per symbol today; cleared when the date rolls over
+        self.daily_trades: Counter = Counter()
+        self._today = ""
+        
+        # Per-symbol REST calls run concurrently over the pooled session
+        self._pool = ThreadPoolExecutor(max_workers=len(SYMBOLS))
+        
+        # Candles fetched once per cycle, shared by exits and signal search
+        self._latest_data: Dict[str, pd.DataFrame] = {}
+        self._latest_price: Dict[str, float] = {}
+        self._latest_atr: Dict[str, float] = {}  # From the last full candle fetch
+        self._last_ts: Dict[str, int] = {}  # Open time (ms) of each symbol's live bar
+        self._now_ms = 0  # Cycle clock, read once after the fetch pass
+        self._now_read = 0.0  # perf_counter() when _now_ms was read
+        self._last_dash_hash = None  # Fingerprint of the last payload queued
+        
+        # Dashboard posts run on a background flusher; only the newest
+        # pending payload is ever sent
+        self._dash_lock = threading.Lock()
+        self._dash_pending: Optional[bytes] = None
+        self._dash_worker: Optional[threading.Thread] = None
+        
         print(f"\n{'='*60}")
         print(f"⚡ {STRATEGY_NAME} TRADER")
         print(f"{'='*60}")
@@ -185,39 +321,66 @@ class TrendMomentumTrader:
     
     def fetch_data(self, symbol: str) -> pd.DataFrame:
         """Fetch 5m data for a symbol (need 250 candles for EMA 200)."""
-        return get_candles(symbol, "5m", 250)
+        return get_candles(symbol, CANDLE_INTERVAL, 250)
+    
+    def fetch_all(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """Fetch data for several symbols in parallel."""
+        return dict(zip(symbols, self._pool.map(self.fetch_data, symbols)))
     
     def run_analysis(self):
         """Run analysis cycle."""
         now = datetime.now().strftime('%H:%M:%S')
-        print(f"\n{'─'*60}")
-        print(f"📊 ANALYSIS @ {now}")
-        print(f"{'─'*60}")
+        logger.info("\n%s\n📊 ANALYSIS @ %s\n%s", _RULE, now, _RULE)
         
         # Update balance
         self.balance = get_balance()
         self.total_pnl = self.balance - self.start_balance
         
+        # Full candle fetch only for symbols whose 5m bar has rolled over;
+        # the rest just need a live price for their open positions.
+        now_ms = int(time.time() * 1000)
+        bar_ms = now_ms - now_ms % CANDLE_INTERVAL_MS
+        stale = [s for s in SYMBOLS if self._last_ts.get(s) != bar_ms]
+        quoted = [s for s in SYMBOLS if s not in stale and s in self.positions]
+        
+        self._latest_data = self.fetch_all(stale)
+        self._latest_price = {}
+        for sym, data in self._latest_data.items():
+            if data.empty:
+                continue
+            self._last_ts[sym] = int(data['time'].values[-1])
+            self._latest_price[sym] = float(data['close'].values[-1])
+            self._latest_atr[sym] = self.strategies[sym].latest_indicators(data)["atr"]
+        for sym, price in zip(quoted, self._pool.map(get_price, quoted)):
+            if price is not None:
+                self._latest_price[sym] = price
+        self._refresh_clock()
+        
         # Check exits first
         self.check_exits()
+        # Exit orders can block for seconds; entries get a fresh clock
+        self._refresh_clock()
         
-        # Look for new signals
-        for symbol in SYMBOLS:
+        # Look for new signals on the bar that just closed; the live bar's
+        # volume is only a few seconds old when it first appears.
+        ready = []
+        for symbol, data in self._latest_data.items():
             if symbol in self.positions:
                 continue
             
-            data = self.fetch_data(symbol)
-            if data.empty or len(data) < 210:
-                print(f"   ⚪ {symbol}: Not enough data")
+            if data.empty or len(data) < 211:
+                logger.info("   ⚪ %s: Not enough data", symbol)
                 continue
             
-            strategy = self.strategies[symbol]
-            signal = strategy.generate_signal(
-                data,
-                account_balance=self.balance,
-                timestamp=int(time.time() * 1000)
-            )
-            
+            ready.append((self.strategies[symbol], data.iloc[:-1]))
+        
+        # Indicator math for each symbol runs on the pool; NumPy releases the GIL
+        futures = [
+            self._pool.submit(strategy.generate_signal, data, self.balance, self._now_ms)
+            for strategy, data in ready
+        ]
+        for future in futures:
+            signal = future.result()
             if signal:
                 self.execute_signal(signal)
         
@@ -227,36 +390,48 @@ class TrendMomentumTrader:
         # Print status
         self.print_status()
     
+    def _refresh_clock(self):
+        """Re-read the cycle clock."""
+        self._now_ms = int(time.time() * 1000)
+        self._now_read = time.perf_counter()
+    
+    def _order_ts(self) -> int:
+        """Order timestamp: the cycle clock, re-read once it is over a second
+        old so a slow earlier order can't push later ones past recvWindow."""
+        if time.perf_counter() - self._now_read > ORDER_CLOCK_MAX_AGE:
+            self._refresh_clock()
+        return self._now_ms
+    
     def execute_signal(self, signal: TradeSignal):
         """Execute a trade signal."""
-        print(f"\n🎯 {signal.signal_type.value} on {signal.symbol}")
-        print(f"   Entry: ${signal.entry_price:.2f}")
-        print(f"   Stop: ${signal.stop_loss:.2f}")
-        print(f"   Target: ${signal.take_profit:.2f}")
-        print(f"   RSI: {signal.rsi:.1f} | ATR: ${signal.atr:.2f}")
-        print(f"   Volume: {signal.volume_ratio:.1f}x avg")
+        logger.info(
+            "\n🎯 %s on %s\n   Entry: $%.2f\n   Stop: $%.2f\n   Target: $%.2f\n"
+            "   RSI: %.1f | ATR: $%.2f\n   Volume: %.1fx avg",
+            signal.signal_type.value, signal.symbol, signal.entry_price, signal.stop_loss,
+            signal.take_profit, signal.rsi, signal.atr, signal.volume_ratio
+        )
         
         size = signal.position_size
         
         if size <= 0:
-            print("   ❌ Size too small")
+            logger.info("   ❌ Size too small")
             return
         
         # Check Daily Limits
-        today_str = datetime.now().strftime('%Y-%m-%d')
-        if not hasattr(self, 'daily_trades'):
-             self.daily_trades = {}
+        today = datetime.now().strftime('%Y-%m-%d')
+        if today != self._today:
+            self.daily_trades.clear()
+            self._today = today
         
-        daily_key = f"{today_str}|{signal.symbol}"
-        count = self.daily_trades.get(daily_key, 0)
+        count = self.daily_trades[signal.symbol]
         
         if count >= 3:
-            print(f"   🚫 Daily Limit Reached for {signal.symbol} ({count}/3)")
+            logger.info("   🚫 Daily Limit Reached for %s (%d/3)", signal.symbol, count)
             return
 
         # Execute
         side = "BUY" if signal.direction == Direction.LONG else "SELL"
-        order = place_order(signal.symbol, side, size)
+        order = place_order(signal.symbol, side, size, timestamp=self._order_ts())
         
         if order:
             self.positions[signal.symbol] = {
@@ -271,136 +446,165 @@ class TrendMomentumTrader:
             self.trades += 1
             
             # Increment Daily Count
-            self.daily_trades[daily_key] = count + 1
+            self.daily_trades[signal.symbol] += 1
             
-            print(f"   ✅ EXECUTED: {side} {size:.6f}")
+            logger.info("   ✅ EXECUTED: %s %.6f", side, size)
     
     def check_exits(self):
         """Check positions for exit conditions with trailing stop logic."""
-        for symbol in list(self.positions.keys()):
-            pos = self.positions[symbol]
+        symbols = [
+            s for s in self.positions
+            if s in self._latest_price and s in self._latest_atr
+        ]
+        if not symbols:
+            return
+        
+        # Pack open positions into parallel arrays and evaluate breakeven,
+        # trailing stop and exit levels for all of them in one pass.
+        # Direction is +1 for LONG, -1 for SHORT.
+        pos = [self.positions[s] for s in symbols]
+        side = np.array([1.0 if p["direction"] is Direction.LONG else -1.0 for p in pos])
+        entry = np.array([p["entry"] for p in pos], dtype=float)
+        sl = np.array([p["sl"] for p in pos], dtype=float)
+        tp = np.array([p["tp"] for p in pos], dtype=float)
+        entry_atr = np.array([p["atr"] for p in pos], dtype=float)
+        be_hit = np.array([p["breakeven_hit"] for p in pos], dtype=bool)
+        current = np.array([self._latest_price[s] for s in symbols], dtype=float)
+        current_atr = np.array([self._latest_atr[s] for s in symbols], dtype=float)
+        
+        # Breakeven
+        breakeven_level = entry + side * entry_atr * BREAKEVEN_ATR
+        new_be = ~be_hit & (side * (current - breakeven_level) >= 0)
+        sl = np.where(new_be, entry, sl)
+        
+        # Trailing stop (only ever tightens)
+        trail_stop = current - side * current_atr * TRAIL_ATR
+        sl = np.where(side * (trail_stop - sl) > 0, trail_stop, sl)
+        
+        stopped = side * (current - sl) <= 0
+        exits = stopped | (side * (current - tp) >= 0)
+        pnl = side * (current - entry)
+        
+        for i, symbol in enumerate(symbols):
+            p = pos[i]
+            if new_be[i]:
+                p["breakeven_hit"] = True
+                logger.info("   🔒 %s %s: Breakeven activated", symbol, p["direction"].value)
+            p["sl"] = float(sl[i])
             
-            # Get current price and ATR
-            data = self.fetch_data(symbol)
-            if data.empty:
+            if not exits[i]:
                 continue
             
-            current = data['close'].iloc[-1]
-            strategy = self.strategies[symbol]
-            current_atr = strategy.calculate_atr(data).iloc[-1]
-            
-            should_exit = False
-            pnl = 0.0
-            reason = ""
+            reason = "STOP LOSS" if stopped[i] else "TAKE PROFIT"
+            qty = p["qty"]
+            trade_pnl = float(pnl[i]) * qty
+            place_order(symbol, "SELL" if side[i] > 0 else "BUY", qty, timestamp=self._order_ts())
             
-            # Update trailing stop
-            if pos["direction"] == Direction.LONG:
-                # Check breakeven
-                breakeven_level = pos["entry"] + (pos["atr"] * BREAKEVEN_ATR)
-                if not pos["breakeven_hit"] and current >= breakeven_level:
-                    pos["sl"] = pos["entry"]
-                    pos["breakeven_hit"] = True
-                    print(f"   🔒 {symbol} LONG: Breakeven activated")
-                
-                # Trailing stop
-                trail_stop = current - (current_atr * TRAIL_ATR)
-                pos["sl"] = max(pos["sl"], trail_stop)
-                
-                # Check exit
-                if current <= pos["sl"]:
-                    should_exit = True
-                    reason = "STOP LOSS"
-                    pnl = (current - pos["entry"]) * pos["qty"]
-                elif current >= pos["tp"]:
-                    should_exit = True
-                    reason = "TAKE PROFIT"
-                    pnl = (current - pos["entry"]) * pos["qty"]
+            self.total_pnl += trade_pnl
             
-            else:  # SHORT
-                # Check breakeven
-                breakeven_level = pos["entry"] - (pos["atr"] * BREAKEVEN_ATR)
-                if not pos["breakeven_hit"] and current <= breakeven_level:
-                    pos["sl"] = pos["entry"]
-                    pos["breakeven_hit"] = True
-                    print(f"   🔒 {symbol} SHORT: Breakeven activated")
-                
-                # Trailing stop
-                trail_stop = current + (current_atr * TRAIL_ATR)
-                pos["sl"] = min(pos["sl"], trail_stop)
-                
-                # Check exit
-                if current >= pos["sl"]:
-                    should_exit = True
-                    reason = "STOP LOSS"
-                    pnl = (pos["entry"] - current) * pos["qty"]
-                elif current <= pos["tp"]:
-                    should_exit = True
-                    reason = "TAKE PROFIT"
-                    pnl = (pos["entry"] - current) * pos["qty"]
+            if trade_pnl > 0:
+                self.wins += 1
+                logger.info("✅ WIN: %s %s +$%.2f", reason, symbol, trade_pnl)
+            else:
+                self.losses += 1
+                logger.info("❌ LOSS: %s %s $%.2f", reason, symbol, trade_pnl)
             
-            if should_exit:
-                side = "SELL" if pos["direction"] == Direction.LONG else "BUY"
-                place_order(symbol, side, pos["qty"])
-                
-                self.total_pnl += pnl
-                
-                if pnl > 0:
-                    self.wins += 1
-                    print(f"✅ WIN: {reason} {symbol} +${pnl:.2f}")
-                else:
-                    self.losses += 1
-                    print(f"❌ LOSS: {reason} {symbol} ${pnl:.2f}")
-                
-                del self.positions[symbol]
+            del self.positions[symbol]
     
     def update_dashboard(self):
-        """Send update to dashboard."""
-        try:
-            payload = {
-                "balance_spot": self.balance,
-                "pnl_spot": self.total_pnl,
-                "signal": STRATEGY_NAME,
-                "confidence": 90,
-                "reasoning": f"Trend Momentum Volatility | {self.market_type.value}",
-                "positions": {
-                    sym: {
-                        "symbol": sym,
-                        "entry_price": p["entry"],
-                        "quantity": p["qty"],
-                        "side": p["direction"].value,
-                        "sl": p["sl"],
-                        "tp": p["tp"]
-                    } for sym, p in self.positions.items()
-                }
+        """Queue an update for the dashboard (skipped when nothing changed)."""
+        fingerprint = hash((
+            self.balance,
+            self.total_pnl,
+            tuple((s, p["entry"], p["qty"], p["sl"], p["tp"]) for s, p in self.positions.items())
+        ))
+        if fingerprint == self._last_dash_hash:
+            return
+        
+        payload = {
+            "balance_spot": self.balance,
+            "pnl_spot": self.total_pnl,
+            "signal": STRATEGY_NAME,
+            "confidence": 90,
+            "reasoning": f"Trend Momentum Volatility | {self.market_type.value}",
+            "positions": {
+                sym: {
+                    "symbol": sym,
+                    "entry_price": p["entry"],
+                    "quantity": p["qty"],
+                    "side": p["direction"].value,
+                    "sl": p["sl"],
+                    "tp": p["tp"]
+                } for sym, p in self.positions.items()
             }
-            requests.post(DASHBOARD_URL, json=payload, timeout=1)
-        except:
-            pass
+        }
+        # orjson encodes in C (and passes NumPy scalars through) instead of
+        # requests' stdlib json path
+        body = orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+        self._last_dash_hash = fingerprint
+        
+        with self._dash_lock:
+            self._dash_pending = body
+            if self._dash_worker is None:
+                self._dash_worker = threading.Thread(target=self._dash_flush, daemon=True)
+                self._dash_worker.start()
+    
+    def _dash_flush(self):
+        """Send pending dashboard payloads until none are left."""
+        while True:
+            with self._dash_lock:
+                body, self._dash_pending = self._dash_pending, None
+                if body is None:
+                    self._dash_worker = None
+                    return
+            
+            try:
+                t0 = time.perf_counter()
+                resp = _DASHBOARD_SESSION.post(DASHBOARD_URL, data=body, timeout=1)
+                _record_latency('dashboard', t0)
+                sent = resp.ok
+            except requests.RequestException:
+                sent = False
+            if not sent:
+                # Dashboard is optional; resend the same state next cycle
+                with self._dash_lock:
+                    if self._dash_pending is None:
+                        self._last_dash_hash = None
+            
+            time.sleep(DASHBOARD_COALESCE)
     
     def print_status(self):
         """Print portfolio status."""
-        print(f"\n💼 Balance: ${self.balance:,.2f} | P&L: ${self.total_pnl:+,.2f}")
-        print(f"   Trades: {self.trades} | W/L: {self.wins}/{self.losses}")
+        logger.info(
+            "\n💼 Balance: $%s | P&L: $%s\n   Trades: %d | W/L: %d/%d",
+            f"{self.balance:,.2f}", f"{self.total_pnl:+,.2f}", self.trades, self.wins, self.losses
+        )
         
         if self.positions:
             for sym, p in self.positions.items():
-                print(f"   📍 {sym} {p['direction'].value} @ ${p['entry']:.2f} (SL: ${p['sl']:.2f})")
+                logger.info("   📍 %s %s @ $%.2f (SL: $%.2f)", sym, p['direction'].value, p['entry'], p['sl'])
         else:
-            print("   ⚪ No positions")
+            logger.info("   ⚪ No positions")
+        
+        latency = latency_summary()
+        if latency:
+            logger.info("   ⏱️ %s", " | ".join(f"{ep}: {ms:.0f}ms" for ep, ms in latency.items()))
         
-        print(f"\n⏳ Next analysis in {ANALYSIS_INTERVAL}s...")
+        logger.info("\n⏳ Next analysis in %ds...", ANALYSIS_INTERVAL)
     
     def run(self):
         """Main loop."""
         while True:
             try:
                 self.run_analysis()
+                _log_buffer.flush()
                 time.sleep(ANALYSIS_INTERVAL)
             except KeyboardInterrupt:
+                _log_buffer.flush()
                 print("\n🛑 Stopped")
                 break
             except Exception as e:
-                print(f"⚠️ Error: {e}")
+                logger.error("⚠️ Error: %s", e)
                 time.sleep(10)
 
 
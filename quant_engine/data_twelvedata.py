@@ -11,12 +11,21 @@ Usage:
 """
 
 import os
+import sys
 import time
 import threading
+import orjson
 import requests
+import numpy as np
 import pandas as pd
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
-from collections import deque
+from collections import OrderedDict
+
+def _to_float(value):
+    """Twelve Data sends most numbers as strings; skip float() when already a float."""
+    return value if value.__class__ is float else float(value)
+
 
 class RateLimiter:
     """
@@ -26,53 +35,65 @@ class RateLimiter:
     def __init__(self, per_minute=8, per_day=800):
         self.per_minute = per_minute
         self.per_day = per_day
-        self.minute_window = deque()  # Timestamps of calls in last minute
+        # Monotonic times of the last `per_minute` credits spent, one slot per
+        # credit, written circularly; the limiter never admits more credits
+        # per minute than it has slots
+        self.ring = [float("-inf")] * per_minute
+        self.head = 0
         self.day_count = 0
-        self.day_reset = datetime.now().replace(hour=0, minute=0, second=0) + timedelta(days=1)
+        # Next local midnight as epoch seconds; recomputed only when it passes
+        self.day_reset_ts = self._next_midnight_ts()
         self.lock = threading.Lock()
     
+    @staticmethod
+    def _next_midnight_ts():
+        """Epoch seconds of the next local midnight (DST-aware, unlike +86400)."""
+        midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        return (midnight + timedelta(days=1)).timestamp()
+    
     def can_call(self, credits=1):
         """Check if we can make an API call."""
         with self.lock:
-            now = datetime.now()
+            now = time.time()
             
             # Reset daily counter at midnight
-            if now >= self.day_reset:
+            if now >= self.day_reset_ts:
                 self.day_count = 0
-                self.day_reset = now.replace(hour=0, minute=0, second=0) + timedelta(days=1)
-            
-            # Clean old entries from minute window
-            cutoff = time.time() - 60
-            while self.minute_window and self.minute_window[0] < cutoff:
-                self.minute_window.popleft()
+                self.day_reset_ts = self._next_midnight_ts()
             
             # Check limits
-            if len(self.minute_window) + credits > self.per_minute:
+            if self._minute_used() + credits > self.per_minute:
                 return False
             if self.day_count + credits > self.per_day:
                 return False
             
             return True
     
+    def _minute_used(self):
+        """Credits spent in the last 60 seconds (caller holds the lock)."""
+        cutoff = time.monotonic() - 60
+        return sum(1 for t in self.ring if t > cutoff)
+    
     def record_call(self, credits=1):
         """Record that an API call was made."""
         with self.lock:
-            self.minute_window.append(time.time())
+            now = time.monotonic()
+            for _ in range(min(credits, self.per_minute)):
+                self.ring[self.head] = now
+                self.head = (self.head + 1) % self.per_minute
             self.day_count += credits
     
     def get_status(self):
         """Get current rate limit status."""
         with self.lock:
-            cutoff = time.time() - 60
-            while self.minute_window and self.minute_window[0] < cutoff:
-                self.minute_window.popleft()
+            minute_used = self._minute_used()
             
             return {
-                "minute_used": len(self.minute_window),
+                "minute_used": minute_used,
                 "minute_limit": self.per_minute,
                 "day_used": self.day_count,
                 "day_limit": self.per_day,
-                "minute_remaining": self.per_minute - len(self.minute_window),
+                "minute_remaining": self.per_minute - minute_used,
                 "day_remaining": self.per_day - self.day_count
             }
 
@@ -81,31 +102,57 @@ class DataCache:
     """
     TTL-based cache for API responses.
     TTL is aligned to timeframe (5min data = 5min cache).
+    
+    Keys are spread over independently locked shards so concurrent lookups
+    for different symbols don't serialize on one lock. Each shard is an LRU
+    capped at maxsize / SHARDS entries. Expiry uses the monotonic clock, so
+    wall-clock adjustments can't extend or cut short an entry's TTL.
     """
-    def __init__(self):
-        self.cache = {}
-        self.lock = threading.Lock()
+    SHARDS = 8  # Power of two; shard index is hash(key) & (SHARDS - 1)
+    
+    def __init__(self, maxsize=256):
+        self.shard_size = max(1, maxsize // self.SHARDS)
+        self.shards = [OrderedDict() for _ in range(self.SHARDS)]
+        self.locks = [threading.Lock() for _ in range(self.SHARDS)]
     
     def get(self, key):
         """Get cached data if not expired."""
-        with self.lock:
-            if key in self.cache:
-                data, expires_at = self.cache[key]
-                if time.time() < expires_at:
+        idx = hash(key) & (self.SHARDS - 1)
+        shard = self.shards[idx]
+        with self.locks[idx]:
+            if key in shard:
+                data, expires_at = shard[key]
+                if time.monotonic() < expires_at:
+                    shard.move_to_end(key)
                     return data
                 else:
-                    del self.cache[key]
+                    del shard[key]
             return None
     
     def set(self, key, data, ttl_seconds):
-        """Cache data with TTL."""
-        with self.lock:
-            self.cache[key] = (data, time.time() + ttl_seconds)
+        """Cache data with TTL, evicting expired then least recently used entries."""
+        idx = hash(key) & (self.SHARDS - 1)
+        shard = self.shards[idx]
+        with self.locks[idx]:
+            now = time.monotonic()
+            shard[key] = (data, now + ttl_seconds)
+            shard.move_to_end(key)
+            
+            # Lazy sweep: drop expired entries from the cold end
+            while shard:
+                oldest = next(iter(shard.values()))
+                if oldest[1] > now:
+                    break
+                shard.popitem(last=False)
+            
+            while len(shard) > self.shard_size:
+                shard.popitem(last=False)
     
     def clear(self):
         """Clear all cached data."""
-        with self.lock:
-            self.cache.clear()
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard.clear()
 
 
 class TwelveDataAdapter:
@@ -127,6 +174,22 @@ class TwelveDataAdapter:
         "1day": 86400
     }
     
+    QUOTE_TTL = 30  # Seconds
+    
+    # Cooldowns (seconds) during which requests are refused without touching
+    # the rate limiter
+    RATE_LIMIT_COOLDOWN = 1.0
+    TOO_MANY_REQUESTS_COOLDOWN = 30.0
+    
+    # Transient server errors are retried here rather than inside urllib3,
+    # so every billed attempt passes through the rate limiter
+    SERVER_ERROR_STATUSES = {500, 502, 503, 504}
+    SERVER_ERROR_RETRIES = 2
+    RETRY_BACKOFF = 0.2
+
+    # Daily and longer bars come back as dates only
+    DATE_ONLY_INTERVALS = {"1day", "1week", "1month"}
+    
     # Symbol mappings (Twelve Data format)
     FOREX_SYMBOLS = {
         "EURUSD": "EUR/USD",
@@ -145,59 +208,122 @@ class TwelveDataAdapter:
         self.cache = DataCache()
         self.last_error = None
         self.is_degraded = False
+        self._backoff_until = 0.0  # Monotonic deadline; plain float, read without a lock
+        
+        # Keep-alive session: repeated calls reuse one TLS connection. The
+        # API key rides on every request via session-level params.
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=0
+        ))
+        self.session.params = {"apikey": self.api_key}
+        
+        # Every common spelling of a known symbol -> Twelve Data format, so
+        # lookups need no string normalization
+        self._symbol_lut = {}
+        for key, td_symbol in self.FOREX_SYMBOLS.items():
+            for alias in (key, td_symbol):
+                self._symbol_lut[alias] = td_symbol
+                self._symbol_lut[alias.lower()] = td_symbol
+    
+    def _td_symbol(self, symbol):
+        """Map a user-facing symbol to Twelve Data format."""
+        td_symbol = self._symbol_lut.get(symbol)
+        if td_symbol is None:
+            # Unknown spellings are normalized per call, not memoized, so
+            # arbitrary caller input cannot grow the table. Interned so
+            # cache-key tuples hash and compare by identity.
+            td_symbol = sys.intern(self.FOREX_SYMBOLS.get(symbol.upper().replace("/", ""), symbol))
+        return td_symbol
+    
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _set_error(self, message, notice=None):
+        """Record a failed call and mark the adapter degraded; print `notice` if given."""
+        self.last_error = message
+        self.is_degraded = True
+        if notice:
+            print(notice)
+        return None
     
     def _make_request(self, endpoint, params, credits=1):
         """
         Make a rate-limited API request.
         Returns parsed JSON or None on error.
         """
-        # Check rate limits
-        if not self.rate_limiter.can_call(credits):
-            self.last_error = "Rate limit exceeded"
-            self.is_degraded = True
-            print(f"⚠️ Twelve Data: Rate limit exceeded. Status: {self.rate_limiter.get_status()}")
+        # Still cooling down from a rate-limit hit: refuse without the limiter lock
+        if time.monotonic() < self._backoff_until:
             return None
         
-        # Make request
         url = f"{self.BASE_URL}/{endpoint}"
-        params["apikey"] = self.api_key
         
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            self.rate_limiter.record_call(credits)
-            
-            if response.status_code == 429:
-                self.last_error = "429 Too Many Requests"
-                self.is_degraded = True
-                print("⚠️ Twelve Data: 429 Too Many Requests")
-                return None
-            
-            if response.status_code != 200:
-                self.last_error = f"HTTP {response.status_code}"
-                self.is_degraded = True
-                return None
+        for attempt in range(self.SERVER_ERROR_RETRIES + 1):
+            # Check rate limits (each retry is billed like a fresh call)
+            if not self.rate_limiter.can_call(credits):
+                self._backoff_until = time.monotonic() + self.RATE_LIMIT_COOLDOWN
+                return self._set_error(
+                    "Rate limit exceeded",
+                    f"⚠️ Twelve Data: Rate limit exceeded. Status: {self.rate_limiter.get_status()}"
+                )
             
-            data = response.json()
-            
-            # Check for API errors
-            if "code" in data and data["code"] != 200:
-                self.last_error = data.get("message", "Unknown API error")
-                self.is_degraded = True
-                print(f"⚠️ Twelve Data API Error: {self.last_error}")
-                return None
-            
-            self.is_degraded = False
-            self.last_error = None
-            return data
-            
-        except requests.exceptions.Timeout:
-            self.last_error = "Request timeout"
-            self.is_degraded = True
-            return None
-        except Exception as e:
-            self.last_error = str(e)
-            self.is_degraded = True
-            return None
+            try:
+                response = self.session.get(url, params=params, timeout=10)
+                self.rate_limiter.record_call(credits)
+                
+                if response.status_code == 429:
+                    self._backoff_until = time.monotonic() + self.TOO_MANY_REQUESTS_COOLDOWN
+                    return self._set_error("429 Too Many Requests", "⚠️ Twelve Data: 429 Too Many Requests")
+                
+                if response.status_code in self.SERVER_ERROR_STATUSES and attempt < self.SERVER_ERROR_RETRIES:
+                    time.sleep(self.RETRY_BACKOFF * (2 ** attempt))
+                    continue
+                
+                if response.status_code != 200:
+                    return self._set_error(f"HTTP {response.status_code}")
+                
+                data = orjson.loads(response.content)
+                
+                # Check for API errors
+                code = data.get("code")
+                if code is not None and code != 200:
+                    message = data.get("message", "Unknown API error")
+                    return self._set_error(message, f"⚠️ Twelve Data API Error: {message}")
+                
+                self.is_degraded = False
+                self.last_error = None
+                return data
+                
+            except requests.exceptions.Timeout:
+                return self._set_error("Request timeout")
+            except orjson.JSONDecodeError:
+                return self._set_error("Invalid JSON response")
+            except Exception as e:
+                return self._set_error(str(e))
+    
+    @staticmethod
+    def _parse_quote(symbol, data):
+        """Convert a Twelve Data quote object into the adapter's quote dict."""
+        return {
+            "symbol": symbol,
+            "price": _to_float(data.get("close", 0.0)),
+            "open": _to_float(data.get("open", 0.0)),
+            "high": _to_float(data.get("high", 0.0)),
+            "low": _to_float(data.get("low", 0.0)),
+            "change": _to_float(data.get("change", 0.0)),
+            "percent_change": _to_float(data.get("percent_change", 0.0)),
+            "timestamp": data.get("datetime", ""),
+            "data_source": "TWELVE_DATA"
+        }
     
     def get_quote(self, symbol):
         """
@@ -205,10 +331,10 @@ class TwelveDataAdapter:
         Returns dict with price, change, etc.
         """
         # Map symbol if needed
-        td_symbol = self.FOREX_SYMBOLS.get(symbol.upper().replace("/", ""), symbol)
+        td_symbol = self._td_symbol(symbol)
         
         # Check cache (30s TTL for quotes)
-        cache_key = f"quote:{td_symbol}"
+        cache_key = ("quote", td_symbol)
         cached = self.cache.get(cache_key)
         if cached:
             return cached
@@ -218,34 +344,69 @@ class TwelveDataAdapter:
         if not data:
             return None
         
-        result = {
-            "symbol": symbol,
-            "price": float(data.get("close", 0)),
-            "open": float(data.get("open", 0)),
-            "high": float(data.get("high", 0)),
-            "low": float(data.get("low", 0)),
-            "change": float(data.get("change", 0)),
-            "percent_change": float(data.get("percent_change", 0)),
-            "timestamp": data.get("datetime", ""),
-            "data_source": "TWELVE_DATA"
-        }
+        result = self._parse_quote(symbol, data)
         
-        self.cache.set(cache_key, result, 30)  # 30s cache
+        self.cache.set(cache_key, result, self.QUOTE_TTL)
         return result
     
+    def get_quotes(self, symbols):
+        """
+        Get quotes for several symbols with a single batched request.
+        Returns {symbol: quote dict or None}. Each quote is cached
+        individually, so later get_quote calls hit the cache.
+        """
+        results = {}
+        missing = {}  # td_symbol -> requested symbol
+        for symbol in symbols:
+            td_symbol = self._td_symbol(symbol)
+            cached = self.cache.get(("quote", td_symbol))
+            if cached:
+                results[symbol] = cached
+            else:
+                results[symbol] = None
+                missing[td_symbol] = symbol
+        
+        if not missing:
+            return results
+        
+        # Twelve Data bills one credit per symbol, batched or not, so batches
+        # larger than the per-minute allowance could never be admitted
+        pending = list(missing)
+        step = self.rate_limiter.per_minute
+        for i in range(0, len(pending), step):
+            batch = pending[i:i + step]
+            data = self._make_request("quote", {"symbol": ",".join(batch)}, credits=len(batch))
+            if not data:
+                break
+            
+            # A single symbol comes back as a bare quote; several are keyed by symbol
+            if len(batch) == 1:
+                data = {batch[0]: data}
+            
+            for td_symbol in batch:
+                quote = data.get(td_symbol)
+                if not quote or quote.get("status") == "error":
+                    continue
+                symbol = missing[td_symbol]
+                result = self._parse_quote(symbol, quote)
+                self.cache.set(("quote", td_symbol), result, self.QUOTE_TTL)
+                results[symbol] = result
+        
+        return results
+    
     def get_time_series(self, symbol, interval="5min", outputsize=100):
         """
         Get historical candle data.
         Returns pandas DataFrame with OHLCV data.
         """
         # Map symbol
-        td_symbol = self.FOREX_SYMBOLS.get(symbol.upper().replace("/", ""), symbol)
+        td_symbol = self._td_symbol(symbol)
         
         # Calculate cache TTL based on interval
         ttl = self.INTERVAL_SECONDS.get(interval, 300)
         
         # Check cache
-        cache_key = f"series:{td_symbol}:{interval}:{outputsize}"
+        cache_key = ("series", td_symbol, interval, outputsize)
         cached = self.cache.get(cache_key)
         if cached is not None:
             return cached
@@ -257,34 +418,37 @@ class TwelveDataAdapter:
             "outputsize": outputsize
         })
         
-        if not data or "values" not in data:
+        if not data or not data.get("values"):
             return pd.DataFrame()
         
-        # Convert to DataFrame
-        df = pd.DataFrame(data["values"])
-        
-        # Format columns
-        df["datetime"] = pd.to_datetime(df["datetime"])
-        df = df.set_index("datetime")
-        
-        # Build dtype mapping only for columns that exist
-        dtype_map = {
-            "open": float,
-            "high": float,
-            "low": float,
-            "close": float
+        # Build typed column arrays in one pass over the rows instead of a
+        # row-wise frame of strings followed by astype. Twelve Data returns
+        # newest first, so reading the rows backwards yields ascending order
+        # (oldest first) without a sort.
+        values = data["values"][::-1]
+        n = len(values)
+        columns = {
+            col: np.fromiter((float(v[col]) for v in values), dtype=np.float64, count=n)
+            for col in ("open", "high", "low", "close")
         }
-        if "volume" in df.columns:
-            dtype_map["volume"] = float
-        
-        df = df.astype(dtype_map)
         
         # Add synthetic volume for Forex (strategy expects it)
-        if "volume" not in df.columns:
-            df["volume"] = 1.0
+        if "volume" in values[0]:
+            columns["volume"] = np.fromiter((float(v["volume"]) for v in values), dtype=np.float64, count=n)
+        else:
+            columns["volume"] = np.ones(n)
+        
+        # Explicit format keeps pandas on its C parser instead of inferring per row
+        fmt = "%Y-%m-%d" if interval in self.DATE_ONLY_INTERVALS else "%Y-%m-%d %H:%M:%S"
+        index = pd.DatetimeIndex(
+            pd.to_datetime([v["datetime"] for v in values], format=fmt, cache=True),
+            name="datetime"
+        )
+        df = pd.DataFrame(columns, index=index, copy=False)
         
-        # Sort ascending (oldest first)
-        df = df.sort_index()
+        # Guard against an unexpected ordering; an O(n) check, sorting only if needed
+        if not index.is_monotonic_increasing:
+            df = df.sort_index()
         
         # Add metadata
         df.attrs["symbol"] = symbol
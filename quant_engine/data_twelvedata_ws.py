@@ -1,5 +1,8 @@
 
 import json
+import logging
+import orjson
+import socket
 import threading
 import time
 import websocket
@@ -8,6 +11,10 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Per-tick output goes through logging (lazy formatting, no stdout write
+# unless the level is enabled); connection lifecycle messages stay as prints
+logger = logging.getLogger(__name__)
+
 class TwelveDataWebSocket:
     """
     WebSocket Client for Twelve Data
@@ -17,6 +24,7 @@ class TwelveDataWebSocket:
     """
     
     WS_URL = "wss://ws.twelvedata.com/v1/quotes/price"
+    PING_INTERVAL = 20  # Seconds; keeps idle connections from being dropped silently
     
     def __init__(self, api_key, symbols):
         self.api_key = api_key.strip() if api_key else ""
@@ -24,10 +32,9 @@ class TwelveDataWebSocket:
         
         self.ws = None
         self.running = False
-        self.latest_prices = {} 
-        self.lock = threading.Lock()
         self.last_msg_time = 0
         self.connected = False
+        self._seen = set()  # Symbols whose first tick has been logged
         
         # Mapping: "EURUSD" -> "EUR/USD"
         self.symbol_map = {}
@@ -41,7 +48,35 @@ class TwelveDataWebSocket:
                  formatted = standard
             
             self.symbol_map[formatted] = standard  # API format -> Internal format
-            
+        
+        # Written only by the WS thread, which replaces a symbol's whole
+        # record in one assignment per tick. Single-key dict set/get is atomic
+        # under the CPython GIL, so readers take no lock and never see a price
+        # paired with another tick's timestamp.
+        self.latest_prices = {}
+        
+        # Any accepted spelling -> internal format, for lookups without
+        # per-call normalization
+        self._internal_lut = {}
+        for formatted, standard in self.symbol_map.items():
+            for alias in (formatted, standard):
+                self._internal_lut[alias] = standard
+                self._internal_lut[alias.lower()] = standard
+        
+        # Symbol set and key are fixed, so build the subscribe frame and the
+        # authenticated URL once instead of on every reconnect
+        self._subscribe_symbols = ",".join(self.symbol_map)
+        self._subscribe_payload = json.dumps({
+            "action": "subscribe",
+            "params": {
+                "symbols": self._subscribe_symbols
+                # "apikey": self.api_key # Try sending without first
+            }
+        })
+        # Auth via URL query param
+        separator = "&" if "?" in self.WS_URL else "?"
+        self._ws_url = f"{self.WS_URL}{separator}apikey={self.api_key}"
+        
         self.thread = threading.Thread(target=self._run_forever, daemon=True)
         
     def start(self):
@@ -58,10 +93,14 @@ class TwelveDataWebSocket:
             
     def get_latest_price(self, symbol):
         """Get latest price for a symbol (internal format e.g. EURUSD)."""
-        clean_sym = symbol.upper().replace("/", "")
-        with self.lock:
-            return self.latest_prices.get(clean_sym)
+        clean_sym = self._internal_lut.get(symbol) or symbol.upper().replace("/", "")
+        record = self.latest_prices.get(clean_sym)
+        return dict(record) if record is not None else None
             
+    def get_all_prices(self):
+        """Snapshot of all symbols that have ticked."""
+        return {sym: dict(record) for sym, record in list(self.latest_prices.items())}
+    
     def is_connected(self):
         """Check if WS is alive and receiving data."""
         return self.connected and (time.time() - self.last_msg_time < 60)
@@ -71,44 +110,58 @@ class TwelveDataWebSocket:
         self.connected = True
         
         # Subscribe
-        subs = list(self.symbol_map.keys())
-        msg = {
-            "action": "subscribe",
-            "params": {
-                "symbols": ",".join(subs)
-                # "apikey": self.api_key # Try sending without first
-            }
-        }
-        print(f"📡 Subscribing to: {msg['params']['symbols']}")
-        ws.send(json.dumps(msg))
+        print(f"📡 Subscribing to: {self._subscribe_symbols}")
+        ws.send(self._subscribe_payload)
         
     def _on_message(self, ws, message):
-        try:
-            data = json.loads(message)
-            self.last_msg_time = time.time()
-            self.connected = True
+        # Only decoding and field conversion can fail on a malformed frame;
+        # those are guarded in the helpers so the common path runs unwrapped
+        data = self._decode(message)
+        if data is None:
+            return
+        self.last_msg_time = time.time()
+        self.connected = True
+        
+        event = data.get("event")
+        if event == "price":
+            tick = self._extract_tick(data)
+            if tick is None:
+                return
+            symbol_in, price, ts = tick
             
-            if data.get("event") == "price":
-                symbol_in = data.get("symbol")
-                price = float(data.get("price", 0))
-                ts = data.get("timestamp", time.time())
-                
-                # Convert symbol to internal format
-                internal_sym = self.symbol_map.get(symbol_in, symbol_in.replace("/", ""))
-                
-                with self.lock:
-                    self.latest_prices[internal_sym] = {
-                        "price": price,
-                        "timestamp": ts,
-                        "source": "WS"
-                    }
-                    if internal_sym == "AAPL":
-                        print(f"📈 AAPL TICK: {price}")
-            elif data.get("event") == "subscribe-status":
-                print(f"ℹ️ WS Status: {data}")
-                
-        except Exception as e:
-            print(f"⚠️ WS Message Error: {e}")
+            # Convert symbol to internal format
+            internal_sym = self.symbol_map.get(symbol_in) or symbol_in.replace("/", "")
+            
+            # Swap in a fresh record; never mutate a published one
+            self.latest_prices[internal_sym] = {"price": price, "timestamp": ts, "source": "WS"}
+            
+            if internal_sym not in self._seen:
+                self._seen.add(internal_sym)
+                print(f"📈 First tick {internal_sym}: {price}")
+            logger.debug("📈 %s tick: %s", internal_sym, price)
+        elif event == "subscribe-status":
+            print(f"ℹ️ WS Status: {data}")
+    
+    @staticmethod
+    def _decode(message):
+        """Parse a frame; None if it is not a JSON object."""
+        try:
+            data = orjson.loads(message)
+        except orjson.JSONDecodeError as e:
+            logger.warning("⚠️ WS Message Error: %s", e)
+            return None
+        return data if isinstance(data, dict) else None
+    
+    @staticmethod
+    def _extract_tick(data):
+        """(symbol, price, timestamp) from a price event; None if malformed."""
+        try:
+            symbol_in = str(data["symbol"])
+            price = float(data.get("price", 0))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("⚠️ WS Message Error: %s", e)
+            return None
+        return symbol_in, price, data.get("timestamp", time.time())
 
     def _on_error(self, ws, error):
         print(f"❌ WS Error: {error}")
@@ -122,18 +175,20 @@ class TwelveDataWebSocket:
         """Main loop with auto-reconnect."""
         while self.running:
             try:
-                # Auth via URL query param
-                separator = "&" if "?" in self.WS_URL else "?"
-                url = f"{self.WS_URL}{separator}apikey={self.api_key}"
-                
                 self.ws = websocket.WebSocketApp(
-                    url,
+                    self._ws_url,
                     on_open=self._on_open,
                     on_message=self._on_message,
                     on_error=self._on_error,
                     on_close=self._on_close
                 )
-                self.ws.run_forever()
+                # Ticks are small and frequent: disable Nagle, and skip the
+                # pure-Python UTF-8 validator since orjson validates on parse
+                self.ws.run_forever(
+                    sockopt=((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),),
+                    ping_interval=self.PING_INTERVAL,
+                    skip_utf8_validation=True
+                )
                 
                 if self.running:
                     time.sleep(10) # Backoff
@@ -66,6 +66,13 @@ class ForexExecution:
         pass 
         
     def get_market_snapshot(self):
+        # Structural copy: price entries are flat dicts of scalars and candle
+        # sets are replaced, never mutated, so no recursive deepcopy is needed
         with self.cache_lock:
-            import copy
-            return copy.deepcopy(self.data_cache)
+            cache = self.data_cache
+            return {
+                "prices": {k: dict(v) for k, v in cache["prices"].items()},
+                "candles": dict(cache["candles"]),
+                "data_source": cache["data_source"],
+                "last_update": cache["last_update"]
+            }
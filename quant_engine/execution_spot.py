@@ -1,8 +1,14 @@
+import numpy as np
+import orjson
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import hmac
 import hashlib
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode
 
 PRECISION_MAP = {
@@ -11,6 +17,27 @@ PRECISION_MAP = {
     "SOLUSDT": 2
 }
 
+# Quantity step per symbol as a multiplier, so quantizing is a floor of
+# qty * scale. Flooring never rounds an order up past the available size.
+_QTY_SCALE = {s: 10.0 ** d for s, d in PRECISION_MAP.items()}
+_DEFAULT_SCALE = 10.0 ** 2
+# Absorbs float noise such as 0.3 * 1000 = 299.99999999999994
+_QTY_EPS = 1e-9
+
+def _now_ms():
+    """Wall-clock epoch ms for signed requests, kept in integer arithmetic."""
+    return time.time_ns() // 1_000_000
+
+# Kline interval -> seconds, for bucketing the candle cache by bar
+INTERVAL_SECONDS = {
+    "1m": 60, "3m": 180, "5m": 300, "15m": 900, "30m": 1800,
+    "1h": 3600, "2h": 7200, "4h": 14400, "6h": 21600, "8h": 28800, "12h": 43200,
+    "1d": 86400
+}
+# Max age (seconds) of a cached candle set; the last row is the still-forming
+# bar, so entries must not outlive a few polls even within one bar
+CANDLE_CACHE_TTL = 5.0
+
 class SpotExecution:
     def __init__(self, api_key, api_secret, testnet=True):
         self.key = api_key
@@ -19,41 +46,91 @@ class SpotExecution:
             self.base_url = 'https://testnet.binance.vision'
         else:
             self.base_url = 'https://api.binance.com'
+        self._order_url = f"{self.base_url}/api/v3/order"
+
+        # One keep-alive pool reused for every call (testnet or live); the API
+        # key header is attached once instead of per request
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=0))
+        if api_key:
+            self.session.headers.update({'X-MBX-APIKEY': api_key})
+
+        # Keyed HMAC state derived once (OpenSSL-backed, ipad/opad already
+        # applied); _sign_query clones it per request
+        self._key_bytes = api_secret.encode('utf-8') if api_secret else b''
+        self._hmac_proto = hmac.new(self._key_bytes, b'', hashlib.sha256)
+
+        # (symbol, interval, limit, bar index, parse_time) -> (fetch time, candles);
+        # repeat polls within CANDLE_CACHE_TTL of a fetch in the same bar are
+        # dict hits
+        self._candle_cache = {}
+        # get_candles_many reads and rebuilds the cache from worker threads
+        self._cache_lock = threading.Lock()
+        # Fan-out pool for get_candles_many, sized to the HTTP pool; created
+        # on first use
+        self._pool = None
 
     def _sign(self, params):
-        query_string = urlencode(params)
-        return hmac.new(self.secret.encode('utf-8'), query_string.encode('utf-8'), hashlib.sha256).hexdigest()
+        return self._sign_query(urlencode(params))
+
+    def _sign_query(self, query):
+        # urlencode output is pure ASCII
+        h = self._hmac_proto.copy()
+        h.update(query.encode('ascii'))
+        return h.hexdigest()
 
-    def get_candles(self, symbol, interval, limit=200):
+    def get_candles(self, symbol, interval, limit=200, parse_time=False):
+        bucket = int(time.time() // INTERVAL_SECONDS.get(interval, 60))
+        key = (symbol, interval, limit, bucket, parse_time)
+        with self._cache_lock:
+            cached = self._candle_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < CANDLE_CACHE_TTL:
+            # Shallow copy so callers can add columns without touching the cache
+            return cached[1].copy(deep=False)
         try:
             url = f"{self.base_url}/api/v3/klines"
             params = {'symbol': symbol, 'interval': interval, 'limit': limit}
-            resp = requests.get(url, params=params, timeout=10)
-            data = resp.json()
+            resp = self.session.get(url, params=params, timeout=10)
+            data = orjson.loads(resp.content)
             
-            df = pd.DataFrame(data, columns=[
-                'time', 'open', 'high', 'low', 'close', 'volume', 
-                'close_time', 'qav', 'num_trades', 'taker_base', 'taker_quote', 'ignore'
-            ])
-            df = df[['time', 'open', 'high', 'low', 'close', 'volume']].astype(float)
-            df['time'] = pd.to_datetime(df['time'], unit='ms')
-            return df
+            # Kline rows are [open_time, open, high, low, close, volume, ...]
+            # with prices as strings; parse only the five used fields straight
+            # into one float block instead of a 12-column object frame + astype.
+            arr = np.array([row[1:6] for row in data], dtype=np.float64).reshape(-1, 5)
+            df = pd.DataFrame(arr, columns=['open', 'high', 'low', 'close', 'volume'], copy=False)
+            # Open times stay int ms unless the caller wants datetimes (plots,
+            # logs); then cast straight to datetime64 without to_datetime
+            open_ms = np.fromiter((row[0] for row in data), dtype=np.int64, count=len(data))
+            if parse_time:
+                open_ms = open_ms.astype('datetime64[ms]').astype('datetime64[ns]')
+            df.insert(0, 'time', open_ms)
+            # Prune on fetch age: bucket numbers are not comparable across intervals
+            now = time.monotonic()
+            with self._cache_lock:
+                self._candle_cache = {k: v for k, v in self._candle_cache.items() if now - v[0] < CANDLE_CACHE_TTL}
+                self._candle_cache[key] = (now, df)
+            return df.copy(deep=False)
         except Exception as e:
             print(f"⚠️ Error Spot Data {symbol}: {e}")
             return pd.DataFrame()
 
+    def get_candles_many(self, symbols, interval, limit=200, parse_time=False):
+        """Fetch candles for several symbols concurrently over the shared session."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=8)
+        return dict(zip(symbols, self._pool.map(lambda s: self.get_candles(s, interval, limit, parse_time), symbols)))
+
     def get_balance(self, asset="USDT"):
         try:
             if not self.key: 
                 print("⚠️ No Spot API Key -> Returning None")
                 return None
-            headers = {'X-MBX-APIKEY': self.key}
-            params = {'timestamp': int(time.time() * 1000)}
+            params = {'timestamp': _now_ms()}
             params['signature'] = self._sign(params)
             
-            resp = requests.get(f"{self.base_url}/api/v3/account", params=params, headers=headers, timeout=10)
+            resp = self.session.get(f"{self.base_url}/api/v3/account", params=params, timeout=10)
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 # Debug Balance
                 # print(f"DEBUG SPOT BAL: {data}")
                 
@@ -76,28 +153,31 @@ class SpotExecution:
 
     def place_order(self, symbol, side, qty, max_retries=3):
         # Spot: BUY only allowed usually in this strat, but SELL for exit
-        decimals = PRECISION_MAP.get(symbol, 2)
-        qty = round(qty, decimals)
+        scale = _QTY_SCALE.get(symbol, _DEFAULT_SCALE)
+        qty = math.floor(qty * scale + _QTY_EPS) / scale
+        if qty <= 0:
+            # Below one step after truncation; Binance would reject it
+            print(f"⚠️ Spot Order Skipped: {symbol} size below minimum step")
+            return None
         
         if not self.key: 
             print(f"🚫 SIMULATED SPOT: {side} {qty} {symbol}")
             return {'status': 'SIMULATED'}
 
-        headers = {'X-MBX-APIKEY': self.key}
-        params = {
+        # Only the timestamp changes between attempts; encode the rest once
+        base_qs = urlencode({
             'symbol': symbol,
             'side': side,
             'type': 'MARKET',
-            'quantity': qty,
-            'timestamp': int(time.time() * 1000)
-        }
+            'quantity': qty
+        })
 
         for i in range(max_retries):
             try:
-                params['timestamp'] = int(time.time() * 1000)
-                params['signature'] = self._sign(params)
+                qs = f"{base_qs}&timestamp={_now_ms()}"
+                url = f"{self._order_url}?{qs}&signature={self._sign_query(qs)}"
                 
-                resp = requests.post(f"{self.base_url}/api/v3/order", params=params, headers=headers, timeout=5)
+                resp = self.session.post(url, timeout=5)
                 
                 if resp.status_code == 200:
                     return resp.json()
@@ -13,6 +13,8 @@ Supports:
 - Multi-timeframe: 5m, 15m, 1h
 """
 
+import logging
+import sys
 import numpy as np
 import pandas as pd
 from typing import Dict, Optional, Tuple
@@ -20,6 +22,11 @@ from dataclasses import dataclass
 from enum import Enum
 
 
+# Signal diagnostics; the host process decides where they go (the trader
+# buffers them with its own cycle output)
+logger = logging.getLogger("strategy")
+
+
 # ============================================================
 # STRATEGY CONFIGURATION
 # ============================================================
@@ -38,6 +45,13 @@ RSI_PERIOD = 14
 ATR_PERIOD = 14
 VOLUME_PERIOD = 20
 
+# Smoothing factors: ewm(span=p, adjust=False) <=> alpha = 2 / (p + 1);
+# RSI and ATR use Wilder smoothing, alpha = 1 / p
+EMA_PERIODS = (EMA_FAST, EMA_MID, EMA_SLOW)
+EMA_ALPHAS = tuple(2.0 / (p + 1) for p in EMA_PERIODS)
+RSI_ALPHA = 1.0 / RSI_PERIOD
+ATR_ALPHA = 1.0 / ATR_PERIOD
+
 # Risk Management
 RISK_PER_TRADE = 0.01  # 1% risk per trade
 SL_ATR_MULTIPLIER = 1.5
@@ -92,6 +106,26 @@ class PositionState:
     breakeven_hit: bool = False
 
 
+@dataclass(frozen=True)
+class EntryRule:
+    """Side-specific entry parameters; `sign` is +1 for longs, -1 for shorts."""
+    sign: float
+    signal_type: SignalType
+    rsi_min: float
+    rsi_max: float
+    cross_fail: str
+
+
+ENTRY_RULES = {
+    # RSI in bullish zone (45-65), close above previous resistance
+    Direction.LONG: EntryRule(1.0, SignalType.LONG_ENTRY, 45, 65,
+                              "No breakout (close={:.2f} < res={:.2f})"),
+    # RSI in bearish zone (35-55), close below previous support
+    Direction.SHORT: EntryRule(-1.0, SignalType.SHORT_ENTRY, 35, 55,
+                               "No breakdown (close={:.2f} > sup={:.2f})"),
+}
+
+
 class TrendMomentumVolatilityStrategy:
     """
     Trend Momentum Volatility Trading Strategy.
@@ -108,6 +142,11 @@ class TrendMomentumVolatilityStrategy:
         self.market_type = market_type
         self.active_position: Optional[PositionState] = None
         
+        # (open time of the last closed bar, (close, EMA 50, EMA 100, EMA 200,
+        # avg gain, avg loss, ATR)) carried between calls so each new bar is
+        # one recursive step
+        self._state: Optional[Tuple[int, Tuple[float, ...]]] = None
+        
     # =========================================================================
     # INDICATOR CALCULATIONS
     # =========================================================================
@@ -118,30 +157,53 @@ class TrendMomentumVolatilityStrategy:
         return series.ewm(span=period, adjust=False).mean()
     
     @staticmethod
-    def calculate_rsi(series: pd.Series, period: int = 14) -> pd.Series:
-        """Calculate Relative Strength Index."""
-        delta = series.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+    def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+        """Wilder smoothing: s_t = s_{t-1} + (x_t - s_{t-1}) / period."""
+        return pd.Series(values).ewm(alpha=1.0 / period, adjust=False).mean().values
+    
+    @staticmethod
+    def _gains_losses(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-bar gains and losses; the first bar counts as neither."""
+        delta = np.empty_like(close)
+        delta[0] = 0.0
+        np.subtract(close[1:], close[:-1], out=delta[1:])
+        return np.maximum(delta, 0.0), np.maximum(-delta, 0.0)
     
     @staticmethod
-    def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
-        """Calculate Average True Range."""
-        high = df['high']
-        low = df['low']
-        close = df['close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
-        return atr
+    def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        """True range; the first bar (no previous close) is just high - low."""
+        prev_close = np.empty_like(close)
+        prev_close[0] = np.nan
+        prev_close[1:] = close[:-1]
+        # Built in place over two buffers; fmax skips the NaN gap on the first bar
+        tr = np.subtract(high, low)
+        gap = np.subtract(high, prev_close)
+        np.fmax(tr, np.abs(gap, out=gap), out=tr)
+        np.subtract(low, prev_close, out=gap)
+        return np.fmax(tr, np.abs(gap, out=gap), out=tr)
+    
+    @staticmethod
+    def _rsi(avg_gain, avg_loss):
+        """RSI from smoothed gains/losses (scalars or arrays)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 100 - (100 / (1 + np.divide(avg_gain, avg_loss)))
+    
+    @classmethod
+    def calculate_rsi(cls, series: pd.Series, period: int = 14) -> pd.Series:
+        """Calculate Relative Strength Index (Wilder)."""
+        gain, loss = cls._gains_losses(np.asarray(series, dtype=np.float64))
+        rsi = cls._rsi(cls._wilder(gain, period), cls._wilder(loss, period))
+        return pd.Series(rsi, index=series.index, copy=False)
+    
+    @classmethod
+    def calculate_atr(cls, df: pd.DataFrame, period: int = 14) -> pd.Series:
+        """Calculate Average True Range (Wilder)."""
+        tr = cls._true_range(
+            np.asarray(df['high'], dtype=np.float64),
+            np.asarray(df['low'], dtype=np.float64),
+            np.asarray(df['close'], dtype=np.float64)
+        )
+        return pd.Series(cls._wilder(tr, period), index=df.index, copy=False)
     
     @staticmethod
     def calculate_sma(series: pd.Series, period: int) -> pd.Series:
@@ -151,16 +213,94 @@ class TrendMomentumVolatilityStrategy:
     @staticmethod
     def find_previous_resistance(df: pd.DataFrame, lookback: int = 20) -> float:
         """Find previous resistance (swing high)."""
-        if len(df) < lookback:
-            return df['high'].max()
-        return df['high'].iloc[-(lookback+1):-1].max()
+        high = df['high'].values
+        if len(high) < lookback:
+            return float(high.max())
+        return float(high[-(lookback+1):-1].max())
     
     @staticmethod
     def find_previous_support(df: pd.DataFrame, lookback: int = 20) -> float:
         """Find previous support (swing low)."""
-        if len(df) < lookback:
-            return df['low'].min()
-        return df['low'].iloc[-(lookback+1):-1].min()
+        low = df['low'].values
+        if len(low) < lookback:
+            return float(low.min())
+        return float(low[-(lookback+1):-1].min())
+    
+    @staticmethod
+    def _step(values: Tuple[float, ...], close: float, high: float, low: float) -> Tuple[float, ...]:
+        """Advance (close, EMA 50/100/200, avg gain, avg loss, ATR) by one bar."""
+        prev_close, ema_50, ema_100, ema_200, avg_gain, avg_loss, atr = values
+        change = close - prev_close
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        a50, a100, a200 = EMA_ALPHAS
+        return (
+            close,
+            ema_50 + a50 * (close - ema_50),
+            ema_100 + a100 * (close - ema_100),
+            ema_200 + a200 * (close - ema_200),
+            avg_gain + RSI_ALPHA * (max(change, 0.0) - avg_gain),
+            avg_loss + RSI_ALPHA * (max(-change, 0.0) - avg_loss),
+            atr + ATR_ALPHA * (tr - atr)
+        )
+    
+    def latest_indicators(self, df: pd.DataFrame) -> Dict[str, float]:
+        """
+        Latest EMA 50/100/200, RSI and ATR.
+        
+        All five are recursive, so with a `time` column (bar open time) the
+        state through the second-to-last bar is kept and only bars newer than
+        the stored one are folded in. The last bar is applied on top without
+        being stored, since it may still be forming; a `df` that ends at the
+        stored bar is answered from the state as is. Falls back to a full
+        recompute when there is no `time` column or the stored bar is not in
+        `df`.
+        
+        Warm state remembers every bar seen since the first call, while a
+        recompute only sees the bars in `df`. EMAs have infinite memory, so
+        on the same 250-bar window a warm instance and a fresh one can
+        differ (EMA 200 by up to ~1%, EMA 100 by ~0.1%), and the trend
+        classification can depend on how long the process has run. The
+        warm value equals a full recompute over the whole history seen.
+        """
+        high = np.asarray(df['high'], dtype=np.float64)
+        low = np.asarray(df['low'], dtype=np.float64)
+        close = np.asarray(df['close'], dtype=np.float64)
+        times = df['time'].values if 'time' in df.columns else None
+        
+        start = None
+        if times is not None and self._state is not None:
+            i = int(np.searchsorted(times, self._state[0]))
+            if i < len(times) and times[i] == self._state[0]:
+                start = i + 1
+        
+        if start == len(close):
+            values = self._state[1]
+        elif start is None:
+            gain, loss = self._gains_losses(close)
+            columns = [close]
+            columns += [pd.Series(close).ewm(span=p, adjust=False).mean().values for p in EMA_PERIODS]
+            columns += [
+                self._wilder(gain, RSI_PERIOD),
+                self._wilder(loss, RSI_PERIOD),
+                self._wilder(self._true_range(high, low, close), ATR_PERIOD)
+            ]
+            if times is not None and len(times) > 1:
+                self._state = (int(times[-2]), tuple(float(c[-2]) for c in columns))
+            values = tuple(float(c[-1]) for c in columns)
+        else:
+            values = self._state[1]
+            for c, h, l in zip(close[start:-1].tolist(), high[start:-1].tolist(), low[start:-1].tolist()):
+                values = self._step(values, c, h, l)
+            self._state = (int(times[-2]), values)
+            values = self._step(values, float(close[-1]), float(high[-1]), float(low[-1]))
+        
+        return {
+            "ema_50": values[1],
+            "ema_100": values[2],
+            "ema_200": values[3],
+            "rsi": float(self._rsi(values[4], values[5])),
+            "atr": values[6]
+        }
     
     # =========================================================================
     # TREND ANALYSIS
@@ -176,12 +316,11 @@ class TrendMomentumVolatilityStrategy:
         if len(df) < EMA_SLOW:
             return {"trend": Direction.NEUTRAL, "ema_50": 0, "ema_100": 0, "ema_200": 0}
         
-        close = df['close']
-        
-        ema_50 = self.calculate_ema(close, EMA_FAST).iloc[-1]
-        ema_100 = self.calculate_ema(close, EMA_MID).iloc[-1]
-        ema_200 = self.calculate_ema(close, EMA_SLOW).iloc[-1]
-        current_close = close.iloc[-1]
+        indicators = self.latest_indicators(df)
+        ema_50 = indicators["ema_50"]
+        ema_100 = indicators["ema_100"]
+        ema_200 = indicators["ema_200"]
+        current_close = float(df['close'].values[-1])
         
         # Bullish Trend Conditions
         trend_bull = (
@@ -235,130 +374,96 @@ class TrendMomentumVolatilityStrategy:
         """
         # Need enough data for EMA 200
         if len(df) < EMA_SLOW + 10:
-            print(f"   ⚪ {self.symbol}: Not enough data ({len(df)} candles, need {EMA_SLOW + 10})")
+            logger.info("   ⚪ %s: Not enough data (%d candles, need %d)", self.symbol, len(df), EMA_SLOW + 10)
             return None
         
-        close = df['close']
-        volume = df['volume']
-        current_close = close.iloc[-1]
+        # Last-bar scalars read straight off the column arrays, as Python
+        # floats so signal prices keep full precision whatever the frame dtype
+        volume = df['volume'].values
+        current_close = float(df['close'].values[-1])
+        current_volume = float(volume[-1])
         
-        # Calculate all indicators
-        rsi = self.calculate_rsi(close, RSI_PERIOD).iloc[-1]
-        atr = self.calculate_atr(df, ATR_PERIOD).iloc[-1]
-        avg_volume = self.calculate_sma(volume, VOLUME_PERIOD).iloc[-1]
-        current_volume = volume.iloc[-1]
+        # Calculate all indicators. RSI and ATR come from the recursive state;
+        # the volume average is a plain mean over its last window.
+        indicators = self.latest_indicators(df)
+        rsi = indicators["rsi"]
+        atr = indicators["atr"]
+        avg_volume = float(volume[-VOLUME_PERIOD:].mean(dtype=np.float64))
         
         # Get trend analysis
         trend_data = self.analyze_trend(df)
         trend = trend_data["trend"]
         
-        # Get support/resistance levels
-        prev_resistance = self.find_previous_resistance(df)
-        prev_support = self.find_previous_support(df)
-        
         # =====================================================================
         # NO TRADE FILTER
         # Skip if RSI is extreme or volume is low
         # =====================================================================
         if rsi > 70 or rsi < 30:
-            print(f"   🚫 {self.symbol}: RSI extreme ({rsi:.1f}) - No trade")
+            logger.info("   🚫 %s: RSI extreme (%.1f) - No trade", self.symbol, rsi)
             return None
             
         if current_volume < avg_volume:
-            print(f"   🚫 {self.symbol}: Volume below average ({current_volume:.0f} < {avg_volume:.0f}) - No trade")
+            logger.info("   🚫 %s: Volume below average (%.0f < %.0f) - No trade", self.symbol, current_volume, avg_volume)
             return None
         
         volume_ratio = current_volume / avg_volume if avg_volume > 0 else 0
         
         # =====================================================================
-        # LONG ENTRY CHECK
+        # ENTRY CHECK (LONG, or SHORT on Futures only)
+        # One code path for both sides; the rule's sign flips the comparisons
+        # and the SL/TP offsets.
         # =====================================================================
-        if trend == Direction.LONG:
-            # RSI in bullish zone (45-65)
-            rsi_ok = 45 <= rsi <= 65
-            # Close above previous resistance (breakout)
-            breakout = current_close > prev_resistance
-            # Volume confirmation
-            volume_ok = current_volume > avg_volume
-            
-            if rsi_ok and breakout and volume_ok:
-                entry_price = current_close
-                stop_loss = entry_price - (atr * SL_ATR_MULTIPLIER)
-                take_profit = entry_price + (atr * TP_ATR_MULTIPLIER)
-                
-                # Position sizing based on risk
-                risk_amount = account_balance * RISK_PER_TRADE
-                risk_distance = entry_price - stop_loss
-                position_size = risk_amount / risk_distance if risk_distance > 0 else 0
-                
-                print(f"   ✅ {self.symbol} LONG Signal: RSI={rsi:.1f}, ATR={atr:.2f}, Vol={volume_ratio:.1f}x")
-                
-                return TradeSignal(
-                    symbol=self.symbol,
-                    timeframe="5m",
-                    signal_type=SignalType.LONG_ENTRY,
-                    direction=Direction.LONG,
-                    entry_price=entry_price,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    position_size=position_size,
-                    atr=atr,
-                    rsi=rsi,
-                    volume_ratio=volume_ratio,
-                    timestamp=timestamp
-                )
-            else:
-                reasons = []
-                if not rsi_ok: reasons.append(f"RSI={rsi:.1f} not in 45-65")
-                if not breakout: reasons.append(f"No breakout (close={current_close:.2f} < res={prev_resistance:.2f})")
-                if not volume_ok: reasons.append("Volume low")
-                print(f"   ⚪ {self.symbol} LONG: {', '.join(reasons)}")
+        rule = ENTRY_RULES.get(trend)
+        if rule is None or (trend == Direction.SHORT and self.market_type != MarketType.FUTURES):
+            return None
+        sign = rule.sign
+        side = trend.value
         
-        # =====================================================================
-        # SHORT ENTRY CHECK (Futures only)
-        # =====================================================================
-        if self.market_type == MarketType.FUTURES and trend == Direction.SHORT:
-            # RSI in bearish zone (35-55)
-            rsi_ok = 35 <= rsi <= 55
-            # Close below previous support (breakdown)
-            breakdown = current_close < prev_support
-            # Volume confirmation
-            volume_ok = current_volume > avg_volume
-            
-            if rsi_ok and breakdown and volume_ok:
-                entry_price = current_close
-                stop_loss = entry_price + (atr * SL_ATR_MULTIPLIER)
-                take_profit = entry_price - (atr * TP_ATR_MULTIPLIER)
-                
-                # Position sizing based on risk
-                risk_amount = account_balance * RISK_PER_TRADE
-                risk_distance = stop_loss - entry_price
-                position_size = risk_amount / risk_distance if risk_distance > 0 else 0
-                
-                print(f"   ✅ {self.symbol} SHORT Signal: RSI={rsi:.1f}, ATR={atr:.2f}, Vol={volume_ratio:.1f}x")
-                
-                return TradeSignal(
-                    symbol=self.symbol,
-                    timeframe="5m",
-                    signal_type=SignalType.SHORT_ENTRY,
-                    direction=Direction.SHORT,
-                    entry_price=entry_price,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    position_size=position_size,
-                    atr=atr,
-                    rsi=rsi,
-                    volume_ratio=volume_ratio,
-                    timestamp=timestamp
-                )
-            else:
-                reasons = []
-                if not rsi_ok: reasons.append(f"RSI={rsi:.1f} not in 35-55")
-                if not breakdown: reasons.append(f"No breakdown (close={current_close:.2f} > sup={prev_support:.2f})")
-                if not volume_ok: reasons.append("Volume low")
-                print(f"   ⚪ {self.symbol} SHORT: {', '.join(reasons)}")
+        # Previous resistance for longs, previous support for shorts
+        if sign > 0:
+            level = self.find_previous_resistance(df)
+        else:
+            level = self.find_previous_support(df)
         
-        return None
+        rsi_ok = rule.rsi_min <= rsi <= rule.rsi_max
+        # Close beyond the level (breakout / breakdown)
+        crossed = (current_close - level) * sign > 0
+        # Volume confirmation
+        volume_ok = current_volume > avg_volume
+        
+        if not (rsi_ok and crossed and volume_ok):
+            reasons = []
+            if not rsi_ok: reasons.append(f"RSI={rsi:.1f} not in {rule.rsi_min}-{rule.rsi_max}")
+            if not crossed: reasons.append(rule.cross_fail.format(current_close, level))
+            if not volume_ok: reasons.append("Volume low")
+            logger.info("   ⚪ %s %s: %s", self.symbol, side, ", ".join(reasons))
+            return None
+        
+        entry_price = current_close
+        stop_loss = entry_price - sign * (atr * SL_ATR_MULTIPLIER)
+        take_profit = entry_price + sign * (atr * TP_ATR_MULTIPLIER)
+        
+        # Position sizing based on risk
+        risk_amount = account_balance * RISK_PER_TRADE
+        risk_distance = (entry_price - stop_loss) * sign
+        position_size = risk_amount / risk_distance if risk_distance > 0 else 0
+        
+        logger.info("   ✅ %s %s Signal: RSI=%.1f, ATR=%.2f, Vol=%.1fx", self.symbol, side, rsi, atr, volume_ratio)
+        
+        return TradeSignal(
+            symbol=self.symbol,
+            timeframe="5m",
+            signal_type=rule.signal_type,
+            direction=trend,
+            entry_price=entry_price,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            position_size=position_size,
+            atr=atr,
+            rsi=rsi,
+            volume_ratio=volume_ratio,
+            timestamp=timestamp
+        )
     
     # =========================================================================
     # POSITION MANAGEMENT (Trailing Stop & Breakeven)
@@ -382,7 +487,7 @@ class TrendMomentumVolatilityStrategy:
             if not pos.breakeven_hit and current_price >= breakeven_level:
                 new_stop = pos.entry_price
                 pos.breakeven_hit = True
-                print(f"   🔒 {self.symbol} LONG: Breakeven activated at {pos.entry_price:.2f}")
+                logger.info("   🔒 %s LONG: Breakeven activated at %.2f", self.symbol, pos.entry_price)
             
             # Trailing stop
             trail_stop = current_price - (current_atr * TRAIL_ATR)
@@ -394,7 +499,7 @@ class TrendMomentumVolatilityStrategy:
             if not pos.breakeven_hit and current_price <= breakeven_level:
                 new_stop = pos.entry_price
                 pos.breakeven_hit = True
-                print(f"   🔒 {self.symbol} SHORT: Breakeven activated at {pos.entry_price:.2f}")
+                logger.info("   🔒 %s SHORT: Breakeven activated at %.2f", self.symbol, pos.entry_price)
             
             # Trailing stop
             trail_stop = current_price + (current_atr * TRAIL_ATR)
@@ -442,14 +547,14 @@ class TrendMomentumVolatilityStrategy:
             atr_at_entry=signal.atr,
             breakeven_hit=False
         )
-        print(f"   📈 Opened {signal.direction.value} @ {signal.entry_price:.2f}")
-        print(f"      SL: {signal.stop_loss:.2f} | TP: {signal.take_profit:.2f}")
-        print(f"      Size: {signal.position_size:.4f}")
+        logger.info("   📈 Opened %s @ %.2f", signal.direction.value, signal.entry_price)
+        logger.info("      SL: %.2f | TP: %.2f", signal.stop_loss, signal.take_profit)
+        logger.info("      Size: %.4f", signal.position_size)
     
     def close_position(self, reason: str):
         """Close the active position."""
         if self.active_position:
-            print(f"   📉 Closed {self.active_position.direction.value} ({reason})")
+            logger.info("   📉 Closed %s (%s)", self.active_position.direction.value, reason)
             self.active_position = None
 
 
@@ -458,6 +563,7 @@ class TrendMomentumVolatilityStrategy:
 # =========================================================================
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     print("=" * 60)
     print(f"STRATEGY: {STRATEGY_NAME}")
     print("=" * 60)
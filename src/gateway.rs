@@ -1,10 +1,14 @@
 use std::net::{TcpListener, TcpStream};
-use std::io::{BufRead, BufReader, Write};
+use std::io::{BufRead, BufReader, Read, Write};
 use std::thread;
 use std::sync::{Arc, Mutex};
-use crate::matching_engine::{Order, Packet};
+use crate::matching_engine::{Order, OrderSide, Packet};
 use rtrb::Producer;
 
+// Binary order frame: u32 LE length prefix, then
+// id u64 | side u8 (0=Buy, 1=Sell) | price u64 | quantity u64 (all LE)
+const ORDER_FRAME_LEN: usize = 25;
+
 pub fn run_gateway(producer: Producer<Packet>) -> Result<(), Box<dyn std::error::Error>> {
     let listener = TcpListener::bind("127.0.0.1:8083")?;
     println!("🌐 [GATEWAY] Listening on 127.0.0.1:8083");
@@ -28,7 +32,60 @@ pub fn run_gateway(producer: Producer<Packet>) -> Result<(), Box<dyn std::error:
     Ok(())
 }
 
-fn handle_client(mut stream: TcpStream, producer: Arc<Mutex<Producer<Packet>>>) {
+fn handle_client(stream: TcpStream, producer: Arc<Mutex<Producer<Packet>>>) {
+    // Sniff the protocol: binary clients open with the frame length byte,
+    // JSON clients with '{'.
+    let mut first = [0u8; 1];
+    match stream.peek(&mut first) {
+        Ok(1) if first[0] as usize == ORDER_FRAME_LEN => handle_binary_client(stream, producer),
+        Ok(1) => handle_json_client(stream, producer),
+        _ => {}
+    }
+}
+
+/// Decode one order frame payload (without the length prefix).
+/// Returns None if the side byte is not 0 (Buy) or 1 (Sell).
+fn decode_order_frame(payload: &[u8; ORDER_FRAME_LEN]) -> Option<Order> {
+    let side = match payload[8] {
+        0 => OrderSide::Buy,
+        1 => OrderSide::Sell,
+        _ => return None,
+    };
+    Some(Order {
+        id: u64::from_le_bytes(payload[0..8].try_into().unwrap()),
+        side,
+        price: u64::from_le_bytes(payload[9..17].try_into().unwrap()),
+        quantity: u64::from_le_bytes(payload[17..25].try_into().unwrap()),
+    })
+}
+
+fn handle_binary_client(stream: TcpStream, producer: Arc<Mutex<Producer<Packet>>>) {
+    let mut reader = BufReader::new(stream);
+    let mut len_buf = [0u8; 4];
+    let mut payload = [0u8; ORDER_FRAME_LEN];
+
+    loop {
+        if reader.read_exact(&mut len_buf).is_err() { break; }
+        if u32::from_le_bytes(len_buf) as usize != ORDER_FRAME_LEN { break; } // Out of sync
+        if reader.read_exact(&mut payload).is_err() { break; }
+
+        let order = match decode_order_frame(&payload) {
+            Some(order) => order,
+            None => {
+                // Malformed frame: report it and drop the connection rather
+                // than silently losing the order and carrying on
+                eprintln!("❌ [GATEWAY] Bad side byte {} in binary frame; closing", payload[8]);
+                let _ = reader.get_mut().write_all(b"{\"status\":\"error\",\"reason\":\"bad_side\"}\n");
+                break;
+            }
+        };
+
+        // Fire-and-forget: binary clients get no per-order ack
+        let _ = producer.lock().unwrap().push(Packet::new(order));
+    }
+}
+
+fn handle_json_client(mut stream: TcpStream, producer: Arc<Mutex<Producer<Packet>>>) {
     let peer_addr = stream.peer_addr().unwrap_or_else(|_| "unknown".parse().unwrap());
     // println!("🔌 New connection from {}", peer_addr); // IO is slow, maybe skip logging
 
@@ -64,3 +121,46 @@ fn handle_client(mut stream: TcpStream, producer: Arc<Mutex<Producer<Packet>>>)
         }
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    // Frames as produced by binance_bridge.pack_order with ids seeded at 42:
+    // pack_order("Buy", 101.25, 3) and pack_order("Sell", 0.5, 7)
+    const BUY_FRAME: [u8; 29] = [
+        0x19, 0x00, 0x00, 0x00,
+        0x2a, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+        0x00,
+        0x8d, 0x27, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+        0x03, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    ];
+    const SELL_FRAME: [u8; 29] = [
+        0x19, 0x00, 0x00, 0x00,
+        0x2b, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+        0x01,
+        0x32, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+        0x07, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    ];
+
+    fn payload(frame: &[u8; 29]) -> [u8; ORDER_FRAME_LEN] {
+        assert_eq!(u32::from_le_bytes(frame[0..4].try_into().unwrap()) as usize, ORDER_FRAME_LEN);
+        frame[4..].try_into().unwrap()
+    }
+
+    #[test]
+    fn decodes_bridge_frames() {
+        let buy = decode_order_frame(&payload(&BUY_FRAME)).unwrap();
+        assert_eq!((buy.id, buy.side, buy.price, buy.quantity), (42, OrderSide::Buy, 10125, 3));
+
+        let sell = decode_order_frame(&payload(&SELL_FRAME)).unwrap();
+        assert_eq!((sell.id, sell.side, sell.price, sell.quantity), (43, OrderSide::Sell, 50, 7));
+    }
+
+    #[test]
+    fn rejects_unknown_side() {
+        let mut bad = payload(&BUY_FRAME);
+        bad[8] = 2;
+        assert!(decode_order_frame(&bad).is_none());
+    }
+}
@@ -0,0 +1,18 @@
+import itertools
+import unittest
+import binance_bridge
+
+# Must match BUY_FRAME / SELL_FRAME in src/gateway.rs (mod tests).
+BUY_FRAME = "190000002a00000000000000008d270000000000000300000000000000"
+SELL_FRAME = "190000002b000000000000000132000000000000000700000000000000"
+
+class TestBridgeFrames(unittest.TestCase):
+    def setUp(self):
+        binance_bridge._order_ids = itertools.count(42)
+
+    def test_pack_order_matches_gateway_fixtures(self):
+        self.assertEqual(binance_bridge.pack_order("Buy", 101.25, 3).hex(), BUY_FRAME)
+        self.assertEqual(binance_bridge.pack_order("Sell", 0.5, 7).hex(), SELL_FRAME)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import orjson
+from quant_engine.execution_futures import FuturesExecution
+from quant_engine.execution_spot import SpotExecution
+
+SYMBOLS = [f"SYM{i}USDT" for i in range(32)]
+
+def fake_klines(url, params=None, timeout=None):
+    # Close price encodes the symbol index so each result can be matched up
+    idx = float(params['symbol'][3:-4])
+    time.sleep(0.01)
+    resp = MagicMock()
+    resp.content = orjson.dumps([[1700000000000 + i * 60000, "1", "2", "0.5", str(idx), "10"]
+                                 for i in range(params['limit'])])
+    return resp
+
+class TestCandlesMany(unittest.TestCase):
+    def check(self, module, cls):
+        with patch(f'{module}.requests.Session.get', side_effect=fake_klines) as mock_get:
+            exec_mod = cls("key", "secret", testnet=True)
+            for _ in range(3):
+                result = exec_mod.get_candles_many(SYMBOLS, "1m", limit=5)
+                self.assertEqual(list(result), SYMBOLS)
+                for i, sym in enumerate(SYMBOLS):
+                    df = result[sym]
+                    self.assertEqual(len(df), 5, sym)
+                    self.assertEqual(df['close'].iloc[-1], float(i))
+            # No insert was lost: every symbol was fetched once, later rounds hit the cache
+            self.assertEqual(len(exec_mod._candle_cache), len(SYMBOLS))
+            self.assertLessEqual(mock_get.call_count, 2 * len(SYMBOLS))
+
+    def test_futures_candles_many(self):
+        self.check('quant_engine.execution_futures', FuturesExecution)
+
+    def test_spot_candles_many(self):
+        self.check('quant_engine.execution_spot', SpotExecution)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import pandas as pd
+from quant_engine.strategy_trend_momentum import TrendMomentumVolatilityStrategy, EMA_PERIODS
+
+BAR_MS = 5 * 60 * 1000
+KEYS = ("ema_50", "ema_100", "ema_200", "rsi", "atr")
+
+
+def make_candles(n=400, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        "open": close,
+        "high": close + rng.random(n),
+        "low": close - rng.random(n),
+        "close": close,
+        "volume": rng.random(n) * 100,
+        "time": np.arange(n, dtype=np.int64) * BAR_MS
+    })
+
+
+def full_recompute(df):
+    """Reference values from the vectorised indicator functions."""
+    cls = TrendMomentumVolatilityStrategy
+    close = df["close"]
+    emas = [close.ewm(span=p, adjust=False).mean().iloc[-1] for p in EMA_PERIODS]
+    return dict(zip(KEYS, emas + [cls.calculate_rsi(close).iloc[-1], cls.calculate_atr(df).iloc[-1]]))
+
+
+class TestLatestIndicators(unittest.TestCase):
+    def assertMatches(self, got, expected):
+        for key in KEYS:
+            self.assertAlmostEqual(got[key], expected[key], places=9, msg=key)
+
+    def test_cold_matches_full_recompute(self):
+        df = make_candles()
+        strategy = TrendMomentumVolatilityStrategy("BTCUSDT")
+        self.assertMatches(strategy.latest_indicators(df), full_recompute(df))
+
+    def test_warm_matches_full_recompute(self):
+        # Sliding 250-bar windows: warm state carries the full history seen
+        df = make_candles()
+        strategy = TrendMomentumVolatilityStrategy("BTCUSDT")
+        for end in range(250, len(df) + 1, 3):
+            got = strategy.latest_indicators(df.iloc[end - 250:end])
+            self.assertMatches(got, full_recompute(df.iloc[:end]))
+
+    def test_frame_ending_at_stored_bar(self):
+        # Full frame (with the forming bar) then closed bars only, as the trader does
+        df = make_candles()
+        strategy = TrendMomentumVolatilityStrategy("BTCUSDT")
+        for end in range(260, len(df) + 1, 5):
+            strategy.latest_indicators(df.iloc[:end])
+            got = strategy.latest_indicators(df.iloc[:end - 1])
+            self.assertMatches(got, full_recompute(df.iloc[:end - 1]))
+
+    def test_missing_time_column_recomputes(self):
+        df = make_candles()
+        strategy = TrendMomentumVolatilityStrategy("BTCUSDT")
+        strategy.latest_indicators(df.iloc[:300])
+        no_time = df.iloc[50:350].drop(columns="time").reset_index(drop=True)
+        self.assertMatches(strategy.latest_indicators(no_time), full_recompute(no_time))
+
+    def test_gap_in_history_recomputes(self):
+        # Stored bar no longer in the frame -> fall back to the window
+        df = make_candles()
+        strategy = TrendMomentumVolatilityStrategy("BTCUSDT")
+        strategy.latest_indicators(df.iloc[:250])
+        window = df.iloc[300:]
+        self.assertMatches(strategy.latest_indicators(window), full_recompute(window))
+
+
+if __name__ == '__main__':
+    unittest.main()
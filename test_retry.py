@@ -4,7 +4,7 @@ import time
 from quant_engine.execution_futures import FuturesExecution
 
 class TestRetryLogic(unittest.TestCase):
-    @patch('quant_engine.execution_futures.requests.post')
+    @patch('quant_engine.execution_futures.requests.Session.post')
     def test_retry_success(self, mock_post):
         # Setup: Fail twice (502), then succeed (200)
         mock_resp_fail = MagicMock()
@@ -25,7 +25,7 @@ class TestRetryLogic(unittest.TestCase):
         self.assertEqual(mock_post.call_count, 3)
         print("✅ Retry Logic Verified: 3 attempts made, success returned.")
 
-    @patch('quant_engine.execution_futures.requests.post')
+    @patch('quant_engine.execution_futures.requests.Session.post')
     def test_retry_failure(self, mock_post):
         # Setup: Fail 3 times (504)
         mock_resp_fail = MagicMock()